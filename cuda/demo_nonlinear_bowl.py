@@ -208,11 +208,11 @@ if rank == 0:
 
 owners_data, ghosts_data = compute_scatterer_data(imap)
 
-owners_idx_d = [cuda.to_device(owner_idx) for owner_idx in owners_data[0]]
+owners_idx_d = owners_data[0]
 owners_size = owners_data[1]
 unique_owners = owners_data[2]
 
-ghosts_idx_d = [cuda.to_device(ghost_idx) for ghost_idx in ghosts_data[0]]
+ghosts_idx_d = ghosts_data[0]
 ghosts_size = ghosts_data[1]
 unique_ghosts = ghosts_data[2]
 
@@ -284,10 +284,10 @@ boundary_facets2 = locate_entities_boundary(
     mesh, mesh.topology.dim - 1, lambda x: np.full(x.shape[1], True)
 )
 
-boundary_data1 = facet_integration_domain(
+cells_b1, lfacet_b1 = facet_integration_domain(
     boundary_facets1, mesh
 )  # cells with boundary facets (source)
-boundary_data2 = facet_integration_domain(
+cells_b2, lfacet_b2 = facet_integration_domain(
     boundary_facets2, mesh
 )  # cells with boundary facets (absorbing)
 local_facet_dof = np.array(
@@ -306,53 +306,42 @@ pts_0 = pts_f[:, 0]
 pts_1 = pts_f[:, 1]
 
 pts_f = np.zeros((6, nq_f, 3), dtype=float_type)
-pts_f[0, :, :] = np.c_[pts_0, pts_1, np.zeros(nq_f, dtype=float_type)]  # z = 0
-pts_f[1, :, :] = np.c_[pts_0, np.zeros(nq_f, dtype=float_type), pts_1]  # y = 0
-pts_f[2, :, :] = np.c_[np.zeros(nq_f, dtype=float_type), pts_0, pts_1]  # x = 0
-pts_f[3, :, :] = np.c_[np.ones(nq_f, dtype=float_type), pts_0, pts_1]  # x = 1
-pts_f[4, :, :] = np.c_[pts_0, np.ones(nq_f, dtype=float_type), pts_1]  # y = 1
-pts_f[5, :, :] = np.c_[pts_0, pts_1, np.ones(nq_f, dtype=float_type)]  # z = 1
+pts_f[0, :, 0], pts_f[0, :, 1] = pts_0, pts_1  # z = 0
+pts_f[1, :, 0], pts_f[1, :, 2] = pts_0, pts_1  # y = 0
+pts_f[2, :, 1], pts_f[2, :, 2] = pts_0, pts_1  # x = 0
+pts_f[3, :, 0], pts_f[3, :, 1], pts_f[3, :, 2] = 1.0, pts_0, pts_1  # x = 1
+pts_f[4, :, 0], pts_f[4, :, 1], pts_f[4, :, 2] = pts_0, 1.0, pts_1  # y = 1
+pts_f[5, :, 0], pts_f[5, :, 1], pts_f[5, :, 2] = pts_0, pts_1, 1.0  # z = 1
 
 # Derivatives on the facets of the reference hexahedron
-dphi_f = np.zeros((6, 3, nq_f, 8), dtype=float_type)
-
-for f in range(6):
-    gtable_f = gelement.tabulate(1, pts_f[f, :, :]).astype(float_type)
-    dphi_f[f, :, :, :] = gtable_f[1:, :, :, 0]
+gtable_f = gelement.tabulate(1, pts_f.reshape(6 * nq_f, 3)).astype(float_type)
+dphi_f = (
+    gtable_f[1:, :, :, 0].reshape(3, 6, nq_f, 8).transpose(1, 0, 2, 3).copy()
+)
 
 # Compute scaled Jacobian determinant (source facets)
 if rank == 0:
     print("Computing scaled Jacobian determinant (source facets)", flush=True)
 
-detJ_f1 = np.zeros((boundary_data1.shape[0], nq_f), dtype=float_type)
+detJ_f1 = np.zeros((cells_b1.size, nq_f), dtype=float_type)
 compute_boundary_facets_scaled_jacobian_determinant(
-    detJ_f1, (x_dofs, x_g), boundary_data1, dphi_f, wts_f
+    detJ_f1, (x_dofs, x_g), (cells_b1, lfacet_b1), dphi_f, wts_f
 )
 
 # Compute scaled Jacobian determinant (absorbing facets)
 if rank == 0:
     print("Computing scaled Jacobian determinant (absorbing facets)", flush=True)
 
-detJ_f2 = np.zeros((boundary_data2.shape[0], nq_f), dtype=float_type)
+detJ_f2 = np.zeros((cells_b2.size, nq_f), dtype=float_type)
 compute_boundary_facets_scaled_jacobian_determinant(
-    detJ_f2, (x_dofs, x_g), boundary_data2, dphi_f, wts_f
+    detJ_f2, (x_dofs, x_g), (cells_b2, lfacet_b2), dphi_f, wts_f
 )
 
 # Create boundary facets dofmap (source)
-bfacet_dofmap1 = np.zeros(
-    (boundary_data1.shape[0], local_facet_dof.shape[1]), dtype=np.int32
-)
-
-for i, (cell, local_facet) in enumerate(boundary_data1):
-    bfacet_dofmap1[i, :] = dofmap[cell][local_facet_dof[local_facet]]
+bfacet_dofmap1 = dofmap[cells_b1[:, np.newaxis], local_facet_dof[lfacet_b1]]
 
 # Create boundary facets dofmap (absorbing)
-bfacet_dofmap2 = np.zeros(
-    (boundary_data2.shape[0], local_facet_dof.shape[1]), dtype=np.int32
-)
-
-for i, (cell, local_facet) in enumerate(boundary_data2):
-    bfacet_dofmap2[i, :] = dofmap[cell][local_facet_dof[local_facet]]
+bfacet_dofmap2 = dofmap[cells_b2[:, np.newaxis], local_facet_dof[lfacet_b2]]
 
 # Define material coefficients
 cell_coeff1 = 1.0 / rho0_ / c0_ / c0_
@@ -363,13 +352,13 @@ cell_coeff5 = 2.0 * beta0_ / rho0_ / rho0_ / c0_ / c0_ / c0_ / c0_
 
 facet_coeff1_1 = np.zeros((bfacet_dofmap1.shape[0]), dtype=float_type)
 facet_coeff2_1 = np.zeros((bfacet_dofmap1.shape[0]), dtype=float_type) 
-for i, (cell, local_facet) in enumerate(boundary_data1):
+for i, cell in enumerate(cells_b1):
     facet_coeff1_1[i] = 1.0 / rho0_[cell]
     facet_coeff2_1[i] = delta0_[cell] / rho0_[cell] / c0_[cell] / c0_[cell]
 
 facet_coeff1_2 = np.zeros((bfacet_dofmap2.shape[0]), dtype=float_type)
 facet_coeff2_2 = np.zeros((bfacet_dofmap2.shape[0]), dtype=float_type)
-for i, (cell, local_facet) in enumerate(boundary_data2):
+for i, cell in enumerate(cells_b2):
     facet_coeff1_2[i] = delta0_[cell] / rho0_[cell] / c0_[cell] / c0_[cell] / c0_[cell]
     facet_coeff2_2[i] = - 1.0 / rho0_[cell] / c0_[cell]
 
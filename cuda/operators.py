@@ -3,8 +3,8 @@
 Operators
 =========
 
-This file contains the kernels for vector assembly. It includes the mass and
-stiffness kernels.
+This file contains the kernels for vector assembly. It includes the mass,
+sum-factorised mass and stiffness kernels.
 
 Copyright (C) 2024 Adeeb Arif Kor
 """
@@ -192,6 +192,137 @@ def stiffness_operator(P, float_type):
     return operator
 
 
+def sum_factorised_mass_operator(P, nq, float_type):
+    """
+    Outer functions to define the compile-time constants for the
+    sum-factorised mass operator.
+
+    Parameters
+    ----------
+    P : basis function polynomial degree
+    nq : number of 1D quadrature points
+    float_type : floating-point type
+    """
+
+    n = P + 1
+
+    @cuda.jit(lineinfo=True)
+    def operator(
+        x: numba.types.Array,
+        entity_constants: numba.types.Array,
+        y: numba.types.Array,
+        detJ_entity: numba.types.Array,
+        entity_dofmap: numba.types.Array,
+        phi: numba.types.Array,
+    ):
+        """
+        Compute the sum-factorised mass operator on some cells.
+
+        Unlike mass_operator, the quadrature points do not need to coincide
+        with the degrees-of-freedom. Each block handles one cell, with the
+        cell DOFs, the 1D basis functions and the intermediate contractions
+        held in shared memory.
+
+        Parameters
+        ----------
+        x : numba.types.Array
+            Input array.
+        entity_constants : numba.types.Array
+            Array containing the material coefficients associated with each entity.
+        y : numba.types.Array
+            Output array where the result of applying the mass operator is accumulated.
+        detJ_entity : numba.types.Array
+            Array containing the determinant of the Jacobian at the tensor
+            product quadrature points (x-direction varying slowest).
+        entity_dofmap : numba.types.Array
+            2D array containing the local degrees of freedom (DOF) on given entities.
+        phi : numba.types.Array
+            2D array containing the 1D basis functions evaluated at the 1D
+            quadrature points (nq x n).
+
+        Notes
+        -----
+        - The kernel should be launched with one block per cell and
+          max(P + 1, nq) threads in each direction of the block.
+
+        """
+
+        tx = cuda.threadIdx.x
+        ty = cuda.threadIdx.y
+        tz = cuda.threadIdx.z
+
+        block_id = cuda.blockIdx.x
+
+        scratch = cuda.shared.array(shape=(n, n, n), dtype=float_type)
+        scratch1 = cuda.shared.array(shape=(nq, n, n), dtype=float_type)
+        scratch2 = cuda.shared.array(shape=(nq, nq, n), dtype=float_type)
+        scratchq = cuda.shared.array(shape=(nq, nq, nq), dtype=float_type)
+        phi_s = cuda.shared.array(shape=(nq, n), dtype=float_type)
+
+        # Gather x expression value and the 1D basis functions
+        if tx < n and ty < n and tz < n:
+            dof = entity_dofmap[block_id, tx * n * n + ty * n + tz]
+            scratch[tx, ty, tz] = x[dof]
+        if tx < nq and ty < n and tz == 0:
+            phi_s[tx, ty] = phi[tx, ty]
+        cuda.syncthreads()
+
+        # Apply contraction in the x-direction
+        if tx < nq and ty < n and tz < n:
+            val = phi_s[tx, 0] * scratch[0, ty, tz]
+            for ix in range(1, n):
+                val += phi_s[tx, ix] * scratch[ix, ty, tz]
+            scratch1[tx, ty, tz] = val
+        cuda.syncthreads()
+
+        # Apply contraction in the y-direction
+        if tx < nq and ty < nq and tz < n:
+            val = phi_s[ty, 0] * scratch1[tx, 0, tz]
+            for iy in range(1, n):
+                val += phi_s[ty, iy] * scratch1[tx, iy, tz]
+            scratch2[tx, ty, tz] = val
+        cuda.syncthreads()
+
+        # Apply contraction in the z-direction and the transform
+        if tx < nq and ty < nq and tz < nq:
+            val = phi_s[tz, 0] * scratch2[tx, ty, 0]
+            for iz in range(1, n):
+                val += phi_s[tz, iz] * scratch2[tx, ty, iz]
+            q = tx * nq * nq + ty * nq + tz
+            scratchq[tx, ty, tz] = (
+                val * detJ_entity[block_id, q] * entity_constants[block_id]
+            )
+        cuda.syncthreads()
+
+        # Apply transposed contraction in the z-direction
+        if tx < nq and ty < nq and tz < n:
+            val = phi_s[0, tz] * scratchq[tx, ty, 0]
+            for iz in range(1, nq):
+                val += phi_s[iz, tz] * scratchq[tx, ty, iz]
+            scratch2[tx, ty, tz] = val
+        cuda.syncthreads()
+
+        # Apply transposed contraction in the y-direction
+        if tx < nq and ty < n and tz < n:
+            val = phi_s[0, ty] * scratch2[tx, 0, tz]
+            for iy in range(1, nq):
+                val += phi_s[iy, ty] * scratch2[tx, iy, tz]
+            scratch1[tx, ty, tz] = val
+        cuda.syncthreads()
+
+        # Apply transposed contraction in the x-direction
+        if tx < n and ty < n and tz < n:
+            val = phi_s[0, tx] * scratch1[0, ty, tz]
+            for ix in range(1, nq):
+                val += phi_s[ix, tx] * scratch1[ix, ty, tz]
+
+            # Atomically add the computed value to the output array `y`
+            dof = entity_dofmap[block_id, tx * n * n + ty * n + tz]
+            cuda.atomic.add(y, dof, val)
+
+    return operator
+
+
 @cuda.jit
 def axpy(alpha: np.floating, x: numba.types.Array, y: numba.types.Array):
     """
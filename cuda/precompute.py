@@ -14,11 +14,32 @@ import numpy.typing as npt
 import numba
 
 
-@numba.njit(fastmath=True)
+@numba.njit(fastmath=True, cache=True)
+def determinant_3x3(A: npt.NDArray[np.floating]):
+    """
+    Compute the determinant of a 3x3 matrix.
+
+    Parameters
+    ----------
+    A : 3x3 matrix
+
+    Return
+    ------
+    det : determinant of A
+    """
+
+    return (
+        A[0, 0] * (A[1, 1] * A[2, 2] - A[1, 2] * A[2, 1])
+        - A[0, 1] * (A[1, 0] * A[2, 2] - A[1, 2] * A[2, 0])
+        + A[0, 2] * (A[1, 0] * A[2, 1] - A[1, 1] * A[2, 0])
+    )
+
+
+@numba.njit(parallel=True, fastmath=True, cache=True)
 def compute_boundary_facets_scaled_jacobian_determinant(
     detJ_f: npt.NDArray[np.floating],
     mesh: tuple[npt.NDArray[np.int32], npt.NDArray[np.floating]],
-    boundary_data: npt.NDArray[np.int32],
+    boundary_data: tuple[npt.NDArray[np.int32], npt.NDArray[np.int32]],
     dphi_f: npt.NDArray[np.floating],
     weights: npt.NDArray[np.floating],
 ):
@@ -32,16 +53,18 @@ def compute_boundary_facets_scaled_jacobian_determinant(
     ----------
     detJ_f : array for the output
     mesh : mesh topology and geometry
-    boundary_data : array containing the cells and local facets indices on the
-        boundary.
+    boundary_data : cells and local facets indices on the boundary
     dphi_f : derivatives of the basis functions on the cell facets.
     weights : quadrature weights
 
     Note: Currently, this function only works for 3D mesh
     """
 
-    dtype = detJ_f.dtype
     x_dofs, x_g = mesh
+    cells, local_facets = boundary_data
+
+    # Geometry precision, detJ_f may be stored in a lower precision
+    dtype = x_g.dtype
 
     nq = weights.size  # Number of quadrature points
 
@@ -58,12 +81,13 @@ def compute_boundary_facets_scaled_jacobian_determinant(
         dtype=dtype,
     )
 
-    for i, (cell, local_facet) in enumerate(boundary_data):
+    for i in numba.prange(cells.size):
+        cell = cells[i]
+        local_facet = local_facets[i]
         coord_dofs = x_g[x_dofs[cell]]
+        dphi = dphi_f[local_facet]
 
         for q in range(nq):
-            dphi = dphi_f[local_facet]
-
             J_cell = dphi[:, q, :] @ coord_dofs[:, :]
 
             J_facet = J_cell.T @ hex_reference_facet_jacobian[local_facet]
@@ -73,7 +97,7 @@ def compute_boundary_facets_scaled_jacobian_determinant(
             detJ_f[i, q] = detJ * weights[q]
 
 
-@numba.njit(fastmath=True)
+@numba.njit(parallel=True, fastmath=True, cache=True)
 def compute_scaled_jacobian_determinant(
     detJ: npt.NDArray[np.floating],
     mesh: tuple[npt.NDArray[np.int32], npt.NDArray[np.floating]],
@@ -103,16 +127,16 @@ def compute_scaled_jacobian_determinant(
     nq = weights.size  # Number of quadrature points
 
     # Compute the scaled Jacobian determinant
-    for cell in range(num_cell):
+    for cell in numba.prange(num_cell):
         coord_dofs = x_g[x_dofs[cell]]
 
         for q in range(nq):
             J_ = dphi[:, q, :] @ coord_dofs[:, :]
 
-            detJ[cell, q] = np.fabs(np.linalg.det(J_)) * weights[q]
+            detJ[cell, q] = np.fabs(determinant_3x3(J_)) * weights[q]
 
 
-@numba.njit(fastmath=True)
+@numba.njit(parallel=True, fastmath=True, cache=True)
 def compute_scaled_geometrical_factor(
     G: npt.NDArray[np.floating],
     mesh: tuple[npt.NDArray[np.int32], npt.NDArray[np.floating]],
@@ -141,7 +165,7 @@ def compute_scaled_geometrical_factor(
     nq = weights.size  # Number of quadrature points
 
     # Compute the scaled geometrical factor
-    for cell in range(num_cell):
+    for cell in numba.prange(num_cell):
         coord_dofs = x_g[x_dofs[cell]]
 
         for q in range(nq):
@@ -152,7 +176,7 @@ def compute_scaled_geometrical_factor(
             G_ = np.linalg.inv(J_).T @ np.linalg.inv(J_)
 
             # Compute the scaled Jacobian determinant
-            sdetJ = np.fabs(np.linalg.det(J_)) * weights[q]
+            sdetJ = np.fabs(determinant_3x3(J_)) * weights[q]
 
             # Only store the upper triangular values since G is symmetric
             G[cell, q, 0] = sdetJ * G_[0, 0]
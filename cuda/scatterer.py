@@ -6,6 +6,10 @@ Scatterers
 This file contains the kernels for MPI communication, namely the scattering
 operation. It includes the scatter reverse and scatter forward kernels.
 
+The pack and unpack kernels are cached on disk, so that their compilation is
+shared by all the processes and subsequent runs. Set NUMBA_CACHE_DIR to a
+shared filesystem if the source directory is not writable.
+
 Copyright (C) 2024 Adeeb Arif Kor
 """
 
@@ -15,7 +19,7 @@ import numba.cuda as cuda
 from mpi4py import MPI
 
 
-@cuda.jit
+@cuda.jit(cache=True)
 def pack_fwd(in_: numba.types.Array, out_: numba.types.Array, index: numba.types.Array):
     """
     Pack coefficient.
@@ -35,7 +39,7 @@ def pack_fwd(in_: numba.types.Array, out_: numba.types.Array, index: numba.types
         out_[idx] = in_[index[idx]]
 
 
-@cuda.jit
+@cuda.jit(cache=True)
 def unpack_fwd(
     in_: numba.types.Array, out_: numba.types.Array, index: numba.types.Array, N: int
 ):
@@ -57,7 +61,7 @@ def unpack_fwd(
         out_[index[idx] + N] = in_[idx]
 
 
-@cuda.jit
+@cuda.jit(cache=True)
 def pack_rev(
     in_: numba.types.Array, out_: numba.types.Array, index: numba.types.Array, N: int
 ):
@@ -79,7 +83,7 @@ def pack_rev(
         out_[idx] = in_[index[idx] + N]
 
 
-@cuda.jit
+@cuda.jit(cache=True)
 def unpack_rev(
     in_: numba.types.Array, out_: numba.types.Array, index: numba.types.Array
 ):
@@ -101,12 +105,115 @@ def unpack_rev(
         cuda.atomic.add(out_, index[idx], in_[idx])
 
 
+def launch_config(size: int):
+    """
+    Compute the launch configuration of the pack and unpack kernels.
+
+    The kernels use few registers and no shared memory, so the occupancy is
+    limited by the number of blocks rather than by the block size. The block
+    size is chosen such that the buffer is spread over all multiprocessors of
+    the device, rounded up to a multiple of the warp size.
+
+    Parameters
+    ----------
+    size : number of entries in the buffer
+
+    Return
+    ------
+    numblocks : number of blocks
+    threadsperblock : number of threads per block
+    """
+
+    device = cuda.get_current_device()
+    num_sm = device.MULTIPROCESSOR_COUNT
+    warp_size = device.WARP_SIZE
+
+    threadsperblock = (size + (num_sm - 1)) // num_sm
+    threadsperblock = ((threadsperblock + (warp_size - 1)) // warp_size) * warp_size
+    threadsperblock = max(warp_size, min(threadsperblock, device.MAX_THREADS_PER_BLOCK))
+
+    numblocks = max(1, (size + (threadsperblock - 1)) // threadsperblock)
+
+    return numblocks, threadsperblock
+
+
+def _concatenate(arrays: list):
+    """
+    Concatenate a list of device index arrays.
+
+    Parameters
+    ----------
+    arrays : list of device index arrays
+
+    Return
+    ------
+    array : concatenated device array
+    offsets : offsets of each input array in the concatenated array
+    """
+
+    offsets = np.zeros(len(arrays) + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum([a.size for a in arrays])
+
+    array = cuda.device_array((int(offsets[-1]),), dtype=np.int64)
+    for i, a in enumerate(arrays):
+        array[offsets[i] : offsets[i + 1]].copy_to_device(a)
+
+    return array, offsets
+
+
+def _mpi_buffers(
+    send_buff: numba.types.Array,
+    recv_buff: numba.types.Array,
+    float_type: np.dtype[np.floating],
+    cuda_aware: bool,
+):
+    """
+    Return the buffers passed to MPI.
+
+    For CUDA-aware MPI these are the device buffers themselves. Otherwise,
+    pinned host buffers of the same sizes are allocated once so that they can
+    be reused for every scatter.
+
+    Parameters
+    ----------
+    send_buff : device send buffer
+    recv_buff : device receive buffer
+    float_type : buffer's floating-point type
+    cuda_aware : whether MPI can communicate device buffers directly
+
+    Return
+    ------
+    send_buff_mpi : send buffer for MPI
+    recv_buff_mpi : receive buffer for MPI
+    stream : CUDA stream for the staging copies
+    """
+
+    if cuda_aware:
+        return send_buff, recv_buff, None
+
+    send_buff_mpi = cuda.pinned_array(send_buff.shape, dtype=float_type)
+    recv_buff_mpi = cuda.pinned_array(recv_buff.shape, dtype=float_type)
+
+    return send_buff_mpi, recv_buff_mpi, cuda.stream()
+
+
+def _scatter_none(buffer: numba.types.Array):
+    """
+    Scatter of a process without neighbours, there is nothing to communicate.
+
+    Parameters
+    ----------
+    buffer : array to perform scatter
+    """
+
+
 def scatter_reverse(
     comm: MPI.Comm,
     owners_data: list,
     ghosts_data: list,
     N: int,
     float_type: np.dtype[np.floating],
+    cuda_aware: bool = True,
 ):
     """
     Outer function to capture the constant variables of the scatter reverse
@@ -121,6 +228,8 @@ def scatter_reverse(
         are ghosts in other processes
     N : size of local array
     float_type : buffer's floating-point type
+    cuda_aware : if True, MPI communicates the device buffers directly,
+        otherwise the buffers are staged through pinned host memory
 
     Return
     ------
@@ -130,12 +239,42 @@ def scatter_reverse(
     owners_idx, owners_size, owners = owners_data
     ghosts_idx, ghosts_size, ghosts = ghosts_data
 
-    send_buff = [
-        cuda.device_array((owner_size,), dtype=float_type) for owner_size in owners_size
+    # Skip the communication and synchronisation entirely if this process has
+    # no neighbours, e.g. in serial runs
+    if not owners.size and not ghosts.size:
+        return _scatter_none
+
+    # Concatenate the indices of all the neighbours, so that packing and
+    # unpacking are a single kernel launch each
+    owners_idx, owners_offsets = _concatenate(owners_idx)
+    ghosts_idx, ghosts_offsets = _concatenate(ghosts_idx)
+
+    send_buff = cuda.device_array((owners_idx.size,), dtype=float_type)
+    recv_buff = cuda.device_array((ghosts_idx.size,), dtype=float_type)
+
+    send_buff_mpi, recv_buff_mpi, stream = _mpi_buffers(
+        send_buff, recv_buff, float_type, cuda_aware
+    )
+
+    # Set the launch configurations
+    config_pack = launch_config(send_buff.size)
+    config_unpack = launch_config(recv_buff.size)
+
+    # Create the persistent communication requests, the neighbourhoods and
+    # buffers are the same for every scatter
+    recv_requests = [
+        comm.Recv_init(
+            recv_buff_mpi[ghosts_offsets[i] : ghosts_offsets[i + 1]], source=src
+        )
+        for i, src in enumerate(ghosts)
     ]
-    recv_buff = [
-        cuda.device_array((ghost_size,), dtype=float_type) for ghost_size in ghosts_size
+    send_requests = [
+        comm.Send_init(
+            send_buff_mpi[owners_offsets[i] : owners_offsets[i + 1]], dest=dest
+        )
+        for i, dest in enumerate(owners)
     ]
+    all_requests = recv_requests + send_requests
 
     def scatter(buffer: numba.types.Array):
         """
@@ -146,41 +285,33 @@ def scatter_reverse(
         buffer : array to perform scatter reverse
         """
 
-        all_requests = []
-
-        # Set the number of threads
-        threadsperblock = 128
+        # Receive (started first so that the incoming messages are placed
+        # directly in the receive buffers)
+        MPI.Prequest.Startall(recv_requests)
 
         # Pack
-        numblocks_pack = [
-            (owner_size + (threadsperblock - 1)) // threadsperblock
-            for owner_size in owners_size
-        ]
-        for i, sb in enumerate(send_buff):
-            pack_rev[numblocks_pack[i], threadsperblock](buffer, sb, owners_idx[i], N)
-        
+        pack_rev[config_pack](buffer, send_buff, owners_idx, N)
+
         # Synchronize
         cuda.synchronize()
 
-        # Send
-        for i, dest in enumerate(owners):
-            reqs = comm.Isend(send_buff[i], dest=dest)
-            all_requests.append(reqs)
+        # Stage the send buffer in pinned host memory
+        if not cuda_aware:
+            send_buff.copy_to_host(send_buff_mpi, stream=stream)
+            stream.synchronize()
 
-        # Receive
-        for i, src in enumerate(ghosts):
-            reqr = comm.Irecv(recv_buff[i], source=src)
-            all_requests.append(reqr)
+        # Send
+        MPI.Prequest.Startall(send_requests)
 
         MPI.Request.Waitall(all_requests)
 
+        # Copy the staged receive buffer back to the device
+        if not cuda_aware:
+            recv_buff.copy_to_device(recv_buff_mpi, stream=stream)
+            stream.synchronize()
+
         # Unpack
-        numblocks_unpack = [
-            (ghost_size + (threadsperblock - 1)) // threadsperblock
-            for ghost_size in ghosts_size
-        ]
-        for i, rb in enumerate(recv_buff):
-            unpack_rev[numblocks_unpack[i], threadsperblock](rb, buffer, ghosts_idx[i])
+        unpack_rev[config_unpack](recv_buff, buffer, ghosts_idx)
 
         # Synchronize
         cuda.synchronize()
@@ -194,6 +325,7 @@ def scatter_forward(
     ghosts_data: list,
     N: int,
     float_type: np.dtype[np.floating],
+    cuda_aware: bool = True,
 ):
     """
     Outer function to capture the constant variables of the scatter forward
@@ -208,6 +340,8 @@ def scatter_forward(
         are ghosts in other processes
     N : size of local array
     float_type : buffer's floating-point type
+    cuda_aware : if True, MPI communicates the device buffers directly,
+        otherwise the buffers are staged through pinned host memory
 
     Return
     ------
@@ -217,12 +351,42 @@ def scatter_forward(
     owners_idx, owners_size, owners = owners_data
     ghosts_idx, ghosts_size, ghosts = ghosts_data
 
-    send_buff = [
-        cuda.device_array((ghost_size,), dtype=float_type) for ghost_size in ghosts_size
+    # Skip the communication and synchronisation entirely if this process has
+    # no neighbours, e.g. in serial runs
+    if not owners.size and not ghosts.size:
+        return _scatter_none
+
+    # Concatenate the indices of all the neighbours, so that packing and
+    # unpacking are a single kernel launch each
+    owners_idx, owners_offsets = _concatenate(owners_idx)
+    ghosts_idx, ghosts_offsets = _concatenate(ghosts_idx)
+
+    send_buff = cuda.device_array((ghosts_idx.size,), dtype=float_type)
+    recv_buff = cuda.device_array((owners_idx.size,), dtype=float_type)
+
+    send_buff_mpi, recv_buff_mpi, stream = _mpi_buffers(
+        send_buff, recv_buff, float_type, cuda_aware
+    )
+
+    # Set the launch configurations
+    config_pack = launch_config(send_buff.size)
+    config_unpack = launch_config(recv_buff.size)
+
+    # Create the persistent communication requests, the neighbourhoods and
+    # buffers are the same for every scatter
+    recv_requests = [
+        comm.Recv_init(
+            recv_buff_mpi[owners_offsets[i] : owners_offsets[i + 1]], source=src
+        )
+        for i, src in enumerate(owners)
     ]
-    recv_buff = [
-        cuda.device_array((owner_size,), dtype=float_type) for owner_size in owners_size
+    send_requests = [
+        comm.Send_init(
+            send_buff_mpi[ghosts_offsets[i] : ghosts_offsets[i + 1]], dest=dest
+        )
+        for i, dest in enumerate(ghosts)
     ]
+    all_requests = recv_requests + send_requests
 
     def scatter(buffer: numba.types.Array):
         """
@@ -233,43 +397,33 @@ def scatter_forward(
         buffer : array to perform scatter forward
         """
 
-        all_requests = []
-
-        # Set the number of threads
-        threadsperblock = 128
+        # Receive (started first so that the incoming messages are placed
+        # directly in the receive buffers)
+        MPI.Prequest.Startall(recv_requests)
 
         # Pack
-        numblocks_pack = [
-            (ghost_size + (threadsperblock - 1)) // threadsperblock
-            for ghost_size in ghosts_size
-        ]
-        for i, sb in enumerate(send_buff):
-            pack_fwd[numblocks_pack[i], threadsperblock](buffer, sb, ghosts_idx[i])
+        pack_fwd[config_pack](buffer, send_buff, ghosts_idx)
 
         # Synchronize
         cuda.synchronize()
 
-        # Send
-        for i, dest in enumerate(ghosts):
-            reqs = comm.Isend(send_buff[i], dest=dest)
-            all_requests.append(reqs)
+        # Stage the send buffer in pinned host memory
+        if not cuda_aware:
+            send_buff.copy_to_host(send_buff_mpi, stream=stream)
+            stream.synchronize()
 
-        # Receive
-        for i, src in enumerate(owners):
-            reqr = comm.Irecv(recv_buff[i], source=src)
-            all_requests.append(reqr)
+        # Send
+        MPI.Prequest.Startall(send_requests)
 
         MPI.Request.Waitall(all_requests)
 
+        # Copy the staged receive buffer back to the device
+        if not cuda_aware:
+            recv_buff.copy_to_device(recv_buff_mpi, stream=stream)
+            stream.synchronize()
+
         # Unpack
-        numblocks_unpack = [
-            (owner_size + (threadsperblock - 1)) // threadsperblock
-            for owner_size in owners_size
-        ]
-        for i, rb in enumerate(recv_buff):
-            unpack_fwd[numblocks_unpack[i], threadsperblock](
-                rb, buffer, owners_idx[i], N
-            )
+        unpack_fwd[config_unpack](recv_buff, buffer, owners_idx, N)
 
         # Synchronize
         cuda.synchronize()
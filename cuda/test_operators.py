@@ -23,7 +23,7 @@ from precompute import (
     compute_scaled_geometrical_factor,
     compute_boundary_facets_scaled_jacobian_determinant,
 )
-from operators import mass_operator, stiffness_operator
+from operators import mass_operator, stiffness_operator, sum_factorised_mass_operator
 from scatterer import scatter_reverse, scatter_forward
 from utils import facet_integration_domain, compute_scatterer_data
 
@@ -81,7 +81,6 @@ mesh.geometry.x[:, :] += np.random.uniform(-0.01, 0.01, (mesh.geometry.x.shape[0
 # Tensor product element
 family = basix.ElementFamily.P
 variant = basix.LagrangeVariant.gll_warped
-cell_type = mesh.basix_cell()
 
 basix_element = basix.create_tp_element(family, cell_type, P, variant, dtype=float_type)
 element = basix.ufl._BasixElement(basix_element)  # basix ufl element
@@ -101,11 +100,11 @@ if rank == 0:
 
 owners_data, ghosts_data = compute_scatterer_data(imap)
 
-owners_idx_d = [cuda.to_device(owner_idx) for owner_idx in owners_data[0]]
+owners_idx_d = owners_data[0]
 owners_size = owners_data[1]
 unique_owners = owners_data[2]
 
-ghosts_idx_d = [cuda.to_device(ghost_idx) for ghost_idx in ghosts_data[0]]
+ghosts_idx_d = ghosts_data[0]
 ghosts_size = ghosts_data[1]
 unique_ghosts = ghosts_data[2]
 
@@ -135,7 +134,7 @@ pts, wts = basix.quadrature.make_quadrature(
 nq = wts.size
 
 gelement = basix.create_element(
-    basix.ElementFamily.P, mesh.basix_cell(), 1, dtype=float_type
+    basix.ElementFamily.P, cell_type, 1, dtype=float_type
 )
 gtable = gelement.tabulate(1, pts)
 dphi = gtable[1:, :, :, 0]
@@ -155,7 +154,7 @@ boundary_facets = locate_entities_boundary(
     mesh, mesh.topology.dim - 1, lambda x: np.full(x.shape[1], True, dtype=bool)
 )
 
-boundary_data = facet_integration_domain(
+cells_b, lfacet_b = facet_integration_domain(
     boundary_facets, mesh
 )  # cells with boundary facets
 local_facet_dof = np.array(
@@ -172,33 +171,27 @@ pts_0 = pts_f[:, 0]
 pts_1 = pts_f[:, 1]
 
 pts_f = np.zeros((6, nq_f, 3), dtype=float_type)
-pts_f[0, :, :] = np.c_[pts_0, pts_1, np.zeros(nq_f, dtype=float_type)]  # z = 0
-pts_f[1, :, :] = np.c_[pts_0, np.zeros(nq_f, dtype=float_type), pts_1]  # y = 0
-pts_f[2, :, :] = np.c_[np.zeros(nq_f, dtype=float_type), pts_0, pts_1]  # x = 0
-pts_f[3, :, :] = np.c_[np.ones(nq_f, dtype=float_type), pts_0, pts_1]  # x = 1
-pts_f[4, :, :] = np.c_[pts_0, np.ones(nq_f, dtype=float_type), pts_1]  # y = 1
-pts_f[5, :, :] = np.c_[pts_0, pts_1, np.ones(nq_f, dtype=float_type)]  # z = 1
+pts_f[0, :, 0], pts_f[0, :, 1] = pts_0, pts_1  # z = 0
+pts_f[1, :, 0], pts_f[1, :, 2] = pts_0, pts_1  # y = 0
+pts_f[2, :, 1], pts_f[2, :, 2] = pts_0, pts_1  # x = 0
+pts_f[3, :, 0], pts_f[3, :, 1], pts_f[3, :, 2] = 1.0, pts_0, pts_1  # x = 1
+pts_f[4, :, 0], pts_f[4, :, 1], pts_f[4, :, 2] = pts_0, 1.0, pts_1  # y = 1
+pts_f[5, :, 0], pts_f[5, :, 1], pts_f[5, :, 2] = pts_0, pts_1, 1.0  # z = 1
 
 # Derivatives on the facets of the reference hexahedron
-dphi_f = np.zeros((6, 3, nq_f, 8), dtype=float_type)
-
-for f in range(6):
-    gtable_f = gelement.tabulate(1, pts_f[f, :, :]).astype(float_type)
-    dphi_f[f, :, :, :] = gtable_f[1:, :, :, 0]
+gtable_f = gelement.tabulate(1, pts_f.reshape(6 * nq_f, 3)).astype(float_type)
+dphi_f = (
+    gtable_f[1:, :, :, 0].reshape(3, 6, nq_f, 8).transpose(1, 0, 2, 3).copy()
+)
 
 # Compute scaled Jacobian determinant (boundary facets)
-detJ_f = np.zeros((boundary_data.shape[0], nq_f), dtype=float_type)
+detJ_f = np.zeros((cells_b.size, nq_f), dtype=float_type)
 compute_boundary_facets_scaled_jacobian_determinant(
-    detJ_f, (x_dofs, x_g), boundary_data, dphi_f, wts_f
+    detJ_f, (x_dofs, x_g), (cells_b, lfacet_b), dphi_f, wts_f
 )
 
 # Create boundary facets dofmap
-bfacet_dofmap = np.zeros(
-    (boundary_data.shape[0], local_facet_dof.shape[1]), dtype=np.int32
-)
-
-for i, (cell, local_facet) in enumerate(boundary_data):
-    bfacet_dofmap[i, :] = dofmap[cell][local_facet_dof[local_facet]]
+bfacet_dofmap = dofmap[cells_b[:, np.newaxis], local_facet_dof[lfacet_b]]
 
 bfacet_constants = np.ones(bfacet_dofmap.shape[0], dtype=float_type)
 
@@ -311,6 +304,139 @@ print(f"Euclidean difference (stiffness operator): {stiffness_difference}", flus
 
 assert stiffness_difference < tol
 
+# ---------------------------- #
+# Sum-factorised mass operator #
+# ---------------------------- #
+
+# Gauss-Jacobi quadrature that does not coincide with the degrees-of-freedom
+Q_sf = 2 * P + 2
+pts_1D_sf, wts_1D_sf = basix.quadrature.make_quadrature(
+    basix.CellType.interval, Q_sf, basix.QuadratureType.gauss_jacobi
+)
+nq_1D_sf = wts_1D_sf.size
+
+# Tensor product quadrature on the hexahedron (x-direction varying slowest)
+tp_idx = np.indices((nq_1D_sf, nq_1D_sf, nq_1D_sf)).reshape(3, -1).T
+pts_sf = pts_1D_sf[tp_idx, 0]
+wts_sf = np.prod(wts_1D_sf[tp_idx], axis=1)
+
+gtable_sf = gelement.tabulate(1, pts_sf)
+dphi_sf = gtable_sf[1:, :, :, 0]
+
+detJ_sf = np.zeros((num_cells, wts_sf.size), dtype=float_type)
+compute_scaled_jacobian_determinant(
+    detJ_sf, (x_dofs, x_g), num_cells, dphi_sf, wts_sf
+)
+
+phi_1D_sf = element_1D.tabulate(0, pts_1D_sf)[0, :, :, 0].astype(float_type)
+
+b[:] = 0.0
+
+# Set the number of threads in a block
+nt_sf = max(nd, nq_1D_sf)
+threadsperblock_sf = (nt_sf, nt_sf, nt_sf)
+num_blocks_sf = num_cells
+
+# Allocate memory on the device
+detJ_sf_d = cuda.to_device(detJ_sf)
+phi_1D_sf_d = cuda.to_device(phi_1D_sf)
+u_d = cuda.to_device(u)
+b_d = cuda.to_device(b)
+
+# Call the sum-factorised mass operator function
+mass_operator_sf = sum_factorised_mass_operator(P, nq_1D_sf, float_type)
+mass_operator_sf[num_blocks_sf, threadsperblock_sf](
+    u_d, cell_constants_d, b_d, detJ_sf_d, dofmap_d, phi_1D_sf_d
+)
+
+# Perform scatter reverse
+scatter_rev(b_d)
+
+# Copy the result back to the host
+b_d.copy_to_host(b)
+
+md_sf = {"quadrature_degree": Q_sf}
+a2_dolfinx = form(inner(u0, v) * dx(metadata=md_sf), dtype=float_type)
+b2_dolfinx = assemble_vector(a2_dolfinx)
+b2_dolfinx.scatter_reverse(InsertMode.add)
+
+# Check the difference between the vectors
+mass_sf_difference = np.linalg.norm(b - b2_dolfinx.array) / np.linalg.norm(
+    b2_dolfinx.array
+)
+print(
+    f"Euclidean difference (sum-factorised mass operator): {mass_sf_difference}",
+    flush=True,
+)
+
+assert mass_sf_difference < tol
+
+# ------------------------------------------ #
+# Stiffness operator (single precision data) #
+# ------------------------------------------ #
+
+# Geometric factors computed from the double precision geometry and stored
+# in single precision, compared against the double precision DOLFINx vector
+mixed_type = np.float32
+tol_mixed = 1e-5
+
+# Compute scaled geometrical factor (single precision output)
+G32 = np.empty((num_cells, nq, (3 * (gdim - 1))), dtype=mixed_type)
+compute_scaled_geometrical_factor(G32, (x_dofs, x_g), num_cells, dphi, wts)
+
+G32_difference = np.linalg.norm(G32 - G) / np.linalg.norm(G)
+print(f"Euclidean difference (single precision G): {G32_difference}", flush=True)
+
+assert G32_difference < tol_mixed
+
+# Compute scaled Jacobian determinant (boundary facets, single precision output)
+detJ_f32 = np.empty((cells_b.size, nq_f), dtype=mixed_type)
+compute_boundary_facets_scaled_jacobian_determinant(
+    detJ_f32, (x_dofs, x_g), (cells_b, lfacet_b), dphi_f, wts_f
+)
+
+detJ_f32_difference = np.linalg.norm(detJ_f32 - detJ_f) / np.linalg.norm(detJ_f)
+print(
+    f"Euclidean difference (single precision detJ_f): {detJ_f32_difference}",
+    flush=True,
+)
+
+assert detJ_f32_difference < tol_mixed
+
+b32 = np.zeros_like(b, dtype=mixed_type)
+
+# Allocate memory on the device
+G32_d = cuda.to_device(G32)
+cell_constants32_d = cuda.to_device(cell_constants.astype(mixed_type))
+dphi_1D32_d = cuda.to_device(dphi_1D.astype(mixed_type))
+u32_d = cuda.to_device(u.astype(mixed_type))
+b32_d = cuda.to_device(b32)
+
+scatter_rev32 = scatter_reverse(comm, owners_data_d, ghosts_data_d, nlocal, mixed_type)
+
+# Call the stiffness operator function
+stiff_operator_cell32 = stiffness_operator(P, mixed_type)
+stiff_operator_cell32[num_blocks, threadsperblock](
+    u32_d, cell_constants32_d, b32_d, G32_d, dofmap_d, dphi_1D32_d
+)
+
+# Perform scatter reverse
+scatter_rev32(b32_d)
+
+# Copy the result back to the host
+b32_d.copy_to_host(b32)
+
+# Check the difference between the vectors
+mixed_difference = np.linalg.norm(b32 - b1_dolfinx.array) / np.linalg.norm(
+    b1_dolfinx.array
+)
+print(
+    f"Euclidean difference (single precision stiffness operator): {mixed_difference}",
+    flush=True,
+)
+
+assert mixed_difference < tol_mixed
+
 # ------------------ #
 # Boundary operators #
 # ------------------ #
@@ -36,6 +36,10 @@ print(f"{rank} : {cuda.get_current_device()}")
 # Set float type
 float_type = np.float64
 
+# Set to False if MPI is not CUDA-aware, the scatter buffers are then staged
+# through pinned host memory
+cuda_aware = True
+
 P = 4  # Basis function order
 Q = {
     2: 3,
@@ -67,7 +71,6 @@ cell_type = mesh.basix_cell()
 # Tensor product element
 family = basix.ElementFamily.P
 variant = basix.LagrangeVariant.gll_warped
-cell_type = mesh.basix_cell()
 
 basix_element = basix.create_tp_element(family, cell_type, P, variant)
 element = basix.ufl._BasixElement(basix_element)  # basix ufl element
@@ -85,13 +88,13 @@ if rank == 0:
 # Scatter data #
 # ------------ #
 
-owners_data, ghosts_data = compute_scatterer_data(imap)
+owners_data, ghosts_data = compute_scatterer_data(imap, cuda_aware)
 
-owners_idx_d = [cuda.to_device(owner_idx) for owner_idx in owners_data[0]]
+owners_idx_d = owners_data[0]
 owners_size = owners_data[1]
 unique_owners = owners_data[2]
 
-ghosts_idx_d = [cuda.to_device(ghost_idx) for ghost_idx in ghosts_data[0]]
+ghosts_idx_d = ghosts_data[0]
 ghosts_size = ghosts_data[1]
 unique_ghosts = ghosts_data[2]
 
@@ -112,7 +115,9 @@ u_ = u0.x.array.copy()
 # Test scatter reverse #
 # -------------------- #
 
-scatter_rev = scatter_reverse(comm, owners_data_d, ghosts_data_d, nlocal, float_type)
+scatter_rev = scatter_reverse(
+    comm, owners_data_d, ghosts_data_d, nlocal, float_type, cuda_aware
+)
 
 # Allocate memory on the device
 u_d = cuda.to_device(u_)
@@ -133,7 +138,9 @@ print(f"REVERSE: {rank}: {np.allclose(u0.x.array, u_)}", flush=True)
 # Test scatter forward #
 # -------------------- #
 
-scatter_fwd = scatter_forward(comm, owners_data_d, ghosts_data_d, nlocal, float_type)
+scatter_fwd = scatter_forward(
+    comm, owners_data_d, ghosts_data_d, nlocal, float_type, cuda_aware
+)
 
 # Allocate memory on the device
 u_d = cuda.to_device(u_)
@@ -1,11 +1,32 @@
 import numpy as np
 import numpy.typing as npt
+import numba
+import numba.cuda as cuda
 from mpi4py import MPI
 from dolfinx.mesh import Mesh
 from dolfinx.geometry import bb_tree, compute_collisions_points, compute_colliding_cells
 
 
-def compute_scatterer_data(index_map):
+@cuda.jit(cache=True)
+def shift_index(index: numba.types.Array, offset: int):
+    """
+    Shift the index array in place.
+
+    Parameters
+    ----------
+    index : index array
+    offset : value to subtract from each index
+    """
+
+    thread_id = cuda.threadIdx.x
+    block_id = cuda.blockIdx.x
+    idx = thread_id + block_id * cuda.blockDim.x
+
+    if idx < index.size:
+        index[idx] -= offset
+
+
+def compute_scatterer_data(index_map, cuda_aware: bool = True):
     """
     Extract scatterer data, i.e., obtain the owners and ghosts 
     degrees-of-freedom.
@@ -13,67 +34,89 @@ def compute_scatterer_data(index_map):
     Parameters
     ----------
     index_map : dolfinx index map
+    cuda_aware : whether MPI can communicate device buffers directly
 
     Return
     ------
-    owners_data : list containing owners data
-    ghosts_data : list containing ghosts data
+    owners_data : list containing owners data (indices on the device)
+    ghosts_data : list containing ghosts data (indices on the device)
     """
 
     # Compute ghosts data in this process that are owned by other processes
     nlocal = index_map.size_local
     nghost = index_map.num_ghosts
     owners = index_map.owners
-    unique_owners, owners_size = np.unique(owners, return_counts=True)
-    owners_argsorted = np.argsort(owners)
+    owners_count = np.bincount(owners, minlength=MPI.COMM_WORLD.size)
+    unique_owners = np.flatnonzero(owners_count)
+    owners_size = owners_count[unique_owners]
+    owners_argsorted = np.argsort(owners, kind="stable")
 
     owners_offsets = np.cumsum(owners_size)
     owners_offsets = np.insert(owners_offsets, 0, 0)
 
-    owners_idx = [np.zeros(size, dtype=np.int64) for size in owners_size]
-    for i, owner in enumerate(unique_owners):
-        begin = owners_offsets[i]
-        end = owners_offsets[i + 1]
-        owners_idx[i] = owners_argsorted[begin:end]
+    owners_idx = [
+        owners_argsorted[owners_offsets[i] : owners_offsets[i + 1]]
+        for i in range(unique_owners.size)
+    ]
 
     # Compute owned data by this process that are ghosts data in other process
     shared_dofs = index_map.index_to_dest_ranks()
-    shared_ranks = np.unique(shared_dofs.array)
-
-    ghosts = []
-    for shared_rank in shared_ranks:
-        for dof in range(nlocal):
-            if shared_rank in shared_dofs.links(dof):
-                ghosts.append(shared_rank)
-
-    ghosts = np.array(ghosts)
+    shared_offsets = shared_dofs.offsets
+    shared_dofs_of_link = np.repeat(
+        np.arange(shared_offsets.size - 1), np.diff(shared_offsets)
+    )
+    ghosts = shared_dofs.array[shared_dofs_of_link < nlocal]
     unique_ghosts, ghosts_size = np.unique(ghosts, return_counts=True)
     ghosts_offsets = np.cumsum(ghosts_size)
     ghosts_offsets = np.insert(ghosts_offsets, 0, 0)
 
-    all_requests = []
+    # Copy the index data to the device. For CUDA-aware MPI the ghost indices
+    # are exchanged directly between the device buffers, otherwise they are
+    # exchanged on the host and copied to the device afterwards.
+    owners_idx_d = [cuda.to_device(owner_idx) for owner_idx in owners_idx]
+    if cuda_aware:
+        send_buff_idx = [
+            cuda.to_device(index_map.ghosts[owner_idx]) for owner_idx in owners_idx
+        ]
+        recv_buff_idx = [
+            cuda.device_array((size,), dtype=np.int64) for size in ghosts_size
+        ]
+    else:
+        send_buff_idx = [index_map.ghosts[owner_idx] for owner_idx in owners_idx]
+        recv_buff_idx = [np.zeros(size, dtype=np.int64) for size in ghosts_size]
+
+    # Synchronize to ensure the send buffers are filled before MPI reads them
+    cuda.synchronize()
 
-    # Send
-    send_buff_idx = [np.zeros(size, dtype=np.int64) for size in owners_size]
-    for i, owner in enumerate(unique_owners):
-        begin = owners_offsets[i]
-        end = owners_offsets[i + 1]
-        send_buff_idx[i] = index_map.ghosts[owners_argsorted[begin:end]]
-        reqs = MPI.COMM_WORLD.Isend(send_buff_idx[i], dest=owner)
-        all_requests.append(reqs)
+    all_requests = []
 
     # Receive
-    recv_buff_idx = [np.zeros(size, dtype=np.int64) for size in ghosts_size]
     for i, ghost in enumerate(unique_ghosts):
         reqr = MPI.COMM_WORLD.Irecv(recv_buff_idx[i], source=ghost)
         all_requests.append(reqr)
 
+    # Send
+    for i, owner in enumerate(unique_owners):
+        reqs = MPI.COMM_WORLD.Isend(send_buff_idx[i], dest=owner)
+        all_requests.append(reqs)
+
     MPI.Request.Waitall(all_requests)
 
-    ghosts_idx = [recv_buff - index_map.local_range[0] for recv_buff in recv_buff_idx]
+    if not cuda_aware:
+        recv_buff_idx = [cuda.to_device(recv_buff) for recv_buff in recv_buff_idx]
+
+    # Convert the received global indices to local indices on the device
+    threadsperblock = 128
+    for recv_buff in recv_buff_idx:
+        numblocks = (recv_buff.size + (threadsperblock - 1)) // threadsperblock
+        shift_index[numblocks, threadsperblock](recv_buff, index_map.local_range[0])
+
+    cuda.synchronize()
+
+    ghosts_idx_d = recv_buff_idx
 
-    owners_data = [owners_idx, owners_size, unique_owners]
-    ghosts_data = [ghosts_idx, ghosts_size, unique_ghosts]
+    owners_data = [owners_idx_d, owners_size, unique_owners]
+    ghosts_data = [ghosts_idx_d, ghosts_size, unique_ghosts]
 
     return owners_data, ghosts_data
 
@@ -89,8 +132,8 @@ def facet_integration_domain(facets: npt.NDArray[np.int32], mesh: Mesh):
 
     Returns
     -------
-    boundary_data : array containing the cells and local facets indices on the
-        boundary.
+    cells : array containing the cells indices on the boundary.
+    local_facets : array containing the local facets indices on the boundary.
     """
 
     tdim = mesh.topology.dim
@@ -99,19 +142,16 @@ def facet_integration_domain(facets: npt.NDArray[np.int32], mesh: Mesh):
     cell_to_facet_map = mesh.topology.connectivity(tdim, tdim - 1)
     facet_to_cell_map = mesh.topology.connectivity(tdim - 1, tdim)
 
-    boundary_facet_cell = np.zeros_like(facets, dtype=np.int32)
-    for i, facet in enumerate(facets):
-        boundary_facet_cell[i] = facet_to_cell_map.links(facet)[0]
-
-    boundary_data = np.zeros((facets.size, 2), dtype=np.int32)
+    cells = np.empty(facets.size, dtype=np.int32)
+    local_facets = np.empty(facets.size, dtype=np.int32)
 
-    for i, (facet, cell) in enumerate(zip(facets, boundary_facet_cell)):
-        facets = cell_to_facet_map.links(cell)
-        local_facet = np.where(facet == facets)
-        boundary_data[i, 0] = cell
-        boundary_data[i, 1] = local_facet[0][0]
+    for i, facet in enumerate(facets):
+        cell = facet_to_cell_map.links(facet)[0]
+        cell_facets = cell_to_facet_map.links(cell)
+        cells[i] = cell
+        local_facets[i] = np.flatnonzero(cell_facets == facet)[0]
 
-    return boundary_data
+    return cells, local_facets
 
 
 def compute_eval_params(mesh, points, float_type):
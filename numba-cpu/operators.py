@@ -4,7 +4,7 @@ Operators
 =========
 
 This file contains the kernels for vector assembly. It includes the boundary
-facet, mass, and stiffness kernels.
+facet, mass, sum-factorised mass, and stiffness kernels.
 
 Copyright (C) 2024 Adeeb Arif Kor
 """
@@ -68,6 +68,133 @@ def mass_operator(N: int, float_type: np.dtype[np.floating]):
     return operator
 
 
+def sum_factorised_mass_operator(P: int, phi: npt.NDArray[np.floating], float_type):
+    """
+    Outer function to define the compile-time constants for the
+    sum-factorised mass operator.
+
+    Unlike mass_operator, the quadrature points do not need to coincide with
+    the degrees-of-freedom. The basis functions are interpolated to the
+    tensor product quadrature points one direction at a time, which costs
+    O(n^4) per cell instead of O(n^6).
+
+    Parameters
+    ----------
+    P : basis function polynomial degree
+    phi : 1D basis functions evaluated at the 1D quadrature points (nq x n)
+    float_type : floating-point type
+    """
+
+    n = P + 1
+    N = n * n * n
+    nq = phi.shape[0]
+    Nq = nq * nq * nq
+
+    phi = phi.flatten()
+
+    # Interpolation to the quadrature points
+    contract_x = contract(n, nq, n, n, True)
+    contract_y = contract(n, nq, nq, n, True)
+    contract_z = contract(n, nq, nq, nq, True)
+    transpose_y = transpose(nq, n, n, n, nq * n, 1)
+    transpose_z = transpose(nq, nq, n, 1, nq, nq * nq)
+
+    # Projection back to the degrees-of-freedom
+    contract_z_T = contract(nq, n, nq, nq, False)
+    contract_y_T = contract(nq, n, nq, n, False)
+    contract_x_T = contract(nq, n, n, n, False)
+    transpose_y_T = transpose(n, nq, nq, 1, n, nq * n)
+    transpose_x_T = transpose(n, nq, n, n, n * n, 1)
+
+    @numba.njit(parallel=True, fastmath=True)
+    def operator(
+        x: npt.NDArray[np.floating],
+        cell_constants: npt.NDArray[np.floating],
+        y: npt.NDArray[np.floating],
+        detJ: npt.NDArray[np.floating],
+        dofmap: npt.NDArray[np.int32],
+    ):
+        """
+        Perform the vector assembly of the sum-factorised mass operator.
+
+        Parameters
+        ----------
+        x : input vector
+        cell_constants : constant values that are defined for each cell.
+        y : output vector
+        detJ : scaled Jacobian determinant at the tensor product quadrature
+            points (x-direction varying slowest)
+        dofmap : degrees-of-freedom map
+        """
+
+        num_cell = cell_constants.size
+
+        # Cells are split into one contiguous block per thread, so that the
+        # temporaries are allocated once per block rather than once per cell
+        num_block = min(numba.get_num_threads(), num_cell)
+
+        # Cell contributions, added to y afterwards as the cells share
+        # degrees-of-freedom
+        y_cells = np.empty((num_cell, N), float_type)
+
+        for block in numba.prange(num_block):
+            # Initialise temporaries
+            x_ = np.zeros(N, float_type)
+
+            T1 = np.zeros(nq * n * n, float_type)
+            T2 = np.zeros(nq * n * n, float_type)
+            T3 = np.zeros(nq * nq * n, float_type)
+            T4 = np.zeros(nq * nq * n, float_type)
+
+            fw = np.zeros(Nq, float_type)
+
+            for cell in range(
+                block * num_cell // num_block, (block + 1) * num_cell // num_block
+            ):
+                T1[:] = 0.0
+                T3[:] = 0.0
+                fw[:] = 0.0
+
+                # Pack coefficients
+                for i in range(N):
+                    x_[i] = x[dofmap[cell, i]]
+
+                # Interpolate to the quadrature points
+                contract_x(phi, x_, T1)  # [q1, i1] x [i1, i2, i3] -> [q1, i2, i3]
+                transpose_y(T1, T2)  # [q1, i2, i3] -> [i2, q1, i3]
+                contract_y(phi, T2, T3)  # [q2, i2] x [i2, q1, i3] -> [q2, q1, i3]
+                transpose_z(T3, T4)  # [q2, q1, i3] -> [i3, q1, q2]
+                contract_z(phi, T4, fw)  # [q3, i3] x [i3, q1, q2] -> [q3, q1, q2]
+
+                # Apply transform
+                for q3 in range(nq):
+                    for q1 in range(nq):
+                        for q2 in range(nq):
+                            fw[q3 * nq * nq + q1 * nq + q2] *= (
+                                detJ[cell, q1 * nq * nq + q2 * nq + q3]
+                                * cell_constants[cell]
+                            )
+
+                T2[:] = 0.0
+                T4[:] = 0.0
+
+                # Project back to the degrees-of-freedom
+                y_ = y_cells[cell]
+                y_[:] = 0.0
+                contract_z_T(phi, fw, T4)  # [j3, q3] x [q3, q1, q2] -> [j3, q1, q2]
+                transpose_y_T(T4, T3)  # [j3, q1, q2] -> [q2, q1, j3]
+                contract_y_T(phi, T3, T2)  # [j2, q2] x [q2, q1, j3] -> [j2, q1, j3]
+                transpose_x_T(T2, T1)  # [j2, q1, j3] -> [q1, j2, j3]
+                contract_x_T(phi, T1, y_)  # [j1, q1] x [q1, j2, j3] -> [j1, j2, j3]
+
+        # Add contributions
+        for cell in range(num_cell):
+            for i in range(N):
+                y[dofmap[cell, i]] += y_cells[cell, i]
+
+    return operator
+
+
 def stiffness_operator(P, dphi, float_type):
     """
     Outer functions to define compile-time constants for the stiffness
@@ -75,6 +75,16 @@ def unpack_fwd(
         out_[idx] = in_[i]
 
 
+def _scatter_none(buffer: npt.NDArray[np.floating]):
+    """
+    Scatter of a process without neighbours, there is nothing to communicate.
+
+    Parameters
+    ----------
+    buffer : array to perform scatter
+    """
+
+
 def scatter_reverse(
     comm: MPI.Comm,
     owners_data: list,
@@ -104,9 +114,26 @@ def scatter_reverse(
     owners_idx, owners_size, owners_offsets, owners = owners_data
     ghosts_idx, ghosts_size, ghosts_offsets, ghosts = ghosts_data
 
+    # Skip the communication and synchronisation entirely if this process has
+    # no neighbours, e.g. in serial runs
+    if not owners.size and not ghosts.size:
+        return _scatter_none
+
     send_buff = np.zeros(np.sum(owners_size), dtype=float_type)
     recv_buff = np.zeros(np.sum(ghosts_size), dtype=float_type)
 
+    # Create the persistent communication requests, the neighbourhoods and
+    # buffers are the same for every scatter
+    recv_requests = [
+        comm.Recv_init(recv_buff[ghosts_offsets[i] : ghosts_offsets[i + 1]], source=src)
+        for i, src in enumerate(ghosts)
+    ]
+    send_requests = [
+        comm.Send_init(send_buff[owners_offsets[i] : owners_offsets[i + 1]], dest=dest)
+        for i, dest in enumerate(owners)
+    ]
+    all_requests = recv_requests + send_requests
+
     def scatter(buffer: npt.NDArray[np.floating]):
         """
         Perform the scatter reverse operation of the buffer array.
@@ -116,22 +143,15 @@ def scatter_reverse(
         buffer : array to perform scatter reverse
         """
 
-        all_requests = []
+        # Receive (started first so that the incoming messages are placed
+        # directly in the receive buffers)
+        MPI.Prequest.Startall(recv_requests)
 
         # Pack
         pack(buffer[N:], send_buff, owners_idx)
 
-        for i, dest in enumerate(owners):
-            begin = owners_offsets[i]
-            end = owners_offsets[i + 1]
-            reqs = comm.Isend(send_buff[begin:end], dest=dest)
-            all_requests.append(reqs)
-
-        for i, src in enumerate(ghosts):
-            begin = ghosts_offsets[i]
-            end = ghosts_offsets[i + 1]
-            reqr = comm.Irecv(recv_buff[begin:end], source=src)
-            all_requests.append(reqr)
+        # Send
+        MPI.Prequest.Startall(send_requests)
 
         MPI.Request.Waitall(all_requests)
 
@@ -170,9 +190,26 @@ def scatter_forward(
     owners_idx, owners_size, owners_offsets, owners = owners_data
     ghosts_idx, ghosts_size, ghosts_offsets, ghosts = ghosts_data
 
+    # Skip the communication and synchronisation entirely if this process has
+    # no neighbours, e.g. in serial runs
+    if not owners.size and not ghosts.size:
+        return _scatter_none
+
     send_buff = np.zeros(np.sum(ghosts_size), dtype=float_type)
     recv_buff = np.zeros(np.sum(owners_size), dtype=float_type)
 
+    # Create the persistent communication requests, the neighbourhoods and
+    # buffers are the same for every scatter
+    recv_requests = [
+        comm.Recv_init(recv_buff[owners_offsets[i] : owners_offsets[i + 1]], source=src)
+        for i, src in enumerate(owners)
+    ]
+    send_requests = [
+        comm.Send_init(send_buff[ghosts_offsets[i] : ghosts_offsets[i + 1]], dest=dest)
+        for i, dest in enumerate(ghosts)
+    ]
+    all_requests = recv_requests + send_requests
+
     def scatter(buffer: npt.NDArray[np.floating]):
         """
         Perform the scatter forward operation of the buffer array.
@@ -182,22 +219,15 @@ def scatter_forward(
         buffer : array to perform scatter forward
         """
 
-        all_requests = []
+        # Receive (started first so that the incoming messages are placed
+        # directly in the receive buffers)
+        MPI.Prequest.Startall(recv_requests)
 
         # Pack
         pack(buffer, send_buff, ghosts_idx)
 
-        for i, dest in enumerate(ghosts):
-            begin = ghosts_offsets[i]
-            end = ghosts_offsets[i + 1]
-            reqs = comm.Isend(send_buff[begin:end], dest=dest)
-            all_requests.append(reqs)
-
-        for i, src in enumerate(owners):
-            begin = owners_offsets[i]
-            end = owners_offsets[i + 1]
-            reqr = comm.Irecv(recv_buff[begin:end], source=src)
-            all_requests.append(reqr)
+        # Send
+        MPI.Prequest.Startall(send_requests)
 
         MPI.Request.Waitall(all_requests)
 
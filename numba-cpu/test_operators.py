@@ -21,7 +21,7 @@ from precompute import (
     compute_scaled_geometrical_factor,
     compute_boundary_facets_scaled_jacobian_determinant,
 )
-from operators import mass_operator, stiffness_operator
+from operators import mass_operator, stiffness_operator, sum_factorised_mass_operator
 from scatterer import scatter_forward, scatter_reverse
 from utils import facet_integration_domain
 
@@ -71,7 +71,6 @@ mesh.geometry.x[:, :] += np.random.uniform(-0.01, 0.01, (mesh.geometry.x.shape[0
 # Tensor product element
 family = basix.ElementFamily.P
 variant = basix.LagrangeVariant.gll_warped
-cell_type = mesh.basix_cell()
 
 basix_element = basix.create_tp_element(family, cell_type, P, variant)
 element = basix.ufl._BasixElement(basix_element)  # basix ufl element
@@ -99,7 +98,7 @@ pts, wts = basix.quadrature.make_quadrature(
 nq = wts.size
 
 gelement = basix.create_element(
-    basix.ElementFamily.P, mesh.basix_cell(), 1, dtype=float_type
+    basix.ElementFamily.P, cell_type, 1, dtype=float_type
 )
 gtable = gelement.tabulate(1, pts)
 dphi = gtable[1:, :, :, 0]
@@ -119,7 +118,7 @@ boundary_facets = locate_entities_boundary(
     mesh, mesh.topology.dim - 1, lambda x: np.full(x.shape[1], True, dtype=bool)
 )
 
-boundary_data = facet_integration_domain(
+cells_b, lfacet_b = facet_integration_domain(
     boundary_facets, mesh
 )  # cells with boundary facets
 local_facet_dof = np.array(
@@ -136,33 +135,27 @@ pts_0 = pts_f[:, 0]
 pts_1 = pts_f[:, 1]
 
 pts_f = np.zeros((6, nq_f, 3), dtype=float_type)
-pts_f[0, :, :] = np.c_[pts_0, pts_1, np.zeros(nq_f, dtype=float_type)]  # z = 0
-pts_f[1, :, :] = np.c_[pts_0, np.zeros(nq_f, dtype=float_type), pts_1]  # y = 0
-pts_f[2, :, :] = np.c_[np.zeros(nq_f, dtype=float_type), pts_0, pts_1]  # x = 0
-pts_f[3, :, :] = np.c_[np.ones(nq_f, dtype=float_type), pts_0, pts_1]  # x = 1
-pts_f[4, :, :] = np.c_[pts_0, np.ones(nq_f, dtype=float_type), pts_1]  # y = 1
-pts_f[5, :, :] = np.c_[pts_0, pts_1, np.ones(nq_f, dtype=float_type)]  # z = 1
+pts_f[0, :, 0], pts_f[0, :, 1] = pts_0, pts_1  # z = 0
+pts_f[1, :, 0], pts_f[1, :, 2] = pts_0, pts_1  # y = 0
+pts_f[2, :, 1], pts_f[2, :, 2] = pts_0, pts_1  # x = 0
+pts_f[3, :, 0], pts_f[3, :, 1], pts_f[3, :, 2] = 1.0, pts_0, pts_1  # x = 1
+pts_f[4, :, 0], pts_f[4, :, 1], pts_f[4, :, 2] = pts_0, 1.0, pts_1  # y = 1
+pts_f[5, :, 0], pts_f[5, :, 1], pts_f[5, :, 2] = pts_0, pts_1, 1.0  # z = 1
 
 # Derivatives on the facets of the reference hexahedron
-dphi_f = np.zeros((6, 3, nq_f, 8), dtype=float_type)
-
-for f in range(6):
-    gtable_f = gelement.tabulate(1, pts_f[f, :, :]).astype(float_type)
-    dphi_f[f, :, :, :] = gtable_f[1:, :, :, 0]
+gtable_f = gelement.tabulate(1, pts_f.reshape(6 * nq_f, 3)).astype(float_type)
+dphi_f = (
+    gtable_f[1:, :, :, 0].reshape(3, 6, nq_f, 8).transpose(1, 0, 2, 3).copy()
+)
 
 # Compute scaled Jacobian determinant (boundary facets)
-detJ_f = np.zeros((boundary_data.shape[0], nq_f), dtype=float_type)
+detJ_f = np.zeros((cells_b.size, nq_f), dtype=float_type)
 compute_boundary_facets_scaled_jacobian_determinant(
-    detJ_f, (x_dofs, x_g), boundary_data, dphi_f, wts_f
+    detJ_f, (x_dofs, x_g), (cells_b, lfacet_b), dphi_f, wts_f
 )
 
 # Create boundary facets dofmap
-bfacet_dofmap = np.zeros(
-    (boundary_data.shape[0], local_facet_dof.shape[1]), dtype=np.int32
-)
-
-for i, (cell, local_facet) in enumerate(boundary_data):
-    bfacet_dofmap[i, :] = dofmap[cell][local_facet_dof[local_facet]]
+bfacet_dofmap = dofmap[cells_b[:, np.newaxis], local_facet_dof[lfacet_b]]
 
 bfacet_constants = np.ones(bfacet_dofmap.shape[0], dtype=float_type)
 
@@ -176,23 +169,21 @@ imap = V.dofmap.index_map
 nlocal = imap.size_local
 nghost = imap.num_ghosts
 owners = imap.owners
-unique_owners, owners_size = np.unique(owners, return_counts=True)
-owners_idx = np.argsort(owners)
+owners_count = np.bincount(owners, minlength=comm.size)
+unique_owners = np.flatnonzero(owners_count)
+owners_size = owners_count[unique_owners]
+owners_idx = np.argsort(owners, kind="stable")
 
 owners_offsets = np.cumsum(owners_size)
 owners_offsets = np.insert(owners_offsets, 0, 0)
 
 # Compute owned data by this process that are ghosts data in other process
 shared_dofs = imap.index_to_dest_ranks()
-shared_ranks = np.unique(shared_dofs.array)
-
-ghosts = []
-for shared_rank in shared_ranks:
-    for dof in range(nlocal):
-        if shared_rank in shared_dofs.links(dof):
-            ghosts.append(shared_rank)
-
-ghosts = np.array(ghosts)
+shared_offsets = shared_dofs.offsets
+shared_dofs_of_link = np.repeat(
+    np.arange(shared_offsets.size - 1), np.diff(shared_offsets)
+)
+ghosts = shared_dofs.array[shared_dofs_of_link < nlocal]
 unique_ghosts, ghosts_size = np.unique(ghosts, return_counts=True)
 ghosts_offsets = np.cumsum(ghosts_size)
 ghosts_offsets = np.insert(ghosts_offsets, 0, 0)
@@ -294,6 +285,53 @@ print(f"Euclidean difference (stiffness operator): {stiffness_difference}", flus
 
 assert stiffness_difference < tol
 
+# ---------------------------- #
+# Sum-factorised mass operator #
+# ---------------------------- #
+
+# Gauss-Jacobi quadrature that does not coincide with the degrees-of-freedom
+Q_sf = 2 * P + 2
+pts_1D_sf, wts_1D_sf = basix.quadrature.make_quadrature(
+    basix.CellType.interval, Q_sf, basix.QuadratureType.gauss_jacobi
+)
+nq_1D_sf = wts_1D_sf.size
+
+# Tensor product quadrature on the hexahedron (x-direction varying slowest)
+tp_idx = np.indices((nq_1D_sf, nq_1D_sf, nq_1D_sf)).reshape(3, -1).T
+pts_sf = pts_1D_sf[tp_idx, 0]
+wts_sf = np.prod(wts_1D_sf[tp_idx], axis=1)
+
+gtable_sf = gelement.tabulate(1, pts_sf)
+dphi_sf = gtable_sf[1:, :, :, 0]
+
+detJ_sf = np.zeros((num_cells, wts_sf.size), dtype=float_type)
+compute_scaled_jacobian_determinant(
+    detJ_sf, (x_dofs, x_g), num_cells, dphi_sf, wts_sf
+)
+
+phi_1D_sf = element_1D.tabulate(0, pts_1D_sf)[0, :, :, 0]
+
+b[:] = 0.0
+mass_operator_sf = sum_factorised_mass_operator(P, phi_1D_sf, float_type)
+mass_operator_sf(u, cell_constants, b, detJ_sf, dofmap)
+scatter_rev(b)
+
+md_sf = {"quadrature_degree": Q_sf}
+a2_dolfinx = form(inner(u0, v) * dx(metadata=md_sf), dtype=float_type)
+b2_dolfinx = assemble_vector(a2_dolfinx)
+b2_dolfinx.scatter_reverse(InsertMode.add)
+
+# Check the difference between the vectors
+mass_sf_difference = np.linalg.norm(b - b2_dolfinx.array) / np.linalg.norm(
+    b2_dolfinx.array
+)
+print(
+    f"Euclidean difference (sum-factorised mass operator): {mass_sf_difference}",
+    flush=True,
+)
+
+assert mass_sf_difference < tol
+
 # ------------------ #
 # Boundary operators #
 # ------------------ #
@@ -26,6 +26,11 @@ from utils import facet_integration_domain
 
 float_type = np.float64
 
+# Number of untimed warm-up calls (the first triggers the JIT compilation)
+# and timed calls of each operator
+num_warmup = 3
+num_repeat = 10
+
 if isinstance(float_type, np.float64):
     tol = 1e-12
 else:
@@ -70,7 +75,6 @@ cell_type = mesh.basix_cell()
 # Tensor product element
 family = basix.ElementFamily.P
 variant = basix.LagrangeVariant.gll_warped
-cell_type = mesh.basix_cell()
 
 basix_element = basix.create_tp_element(family, cell_type, P, variant)
 element = basix.ufl._BasixElement(basix_element)  # basix ufl element
@@ -101,7 +105,7 @@ pts, wts = basix.quadrature.make_quadrature(
 nq = wts.size
 
 gelement = basix.create_element(
-    basix.ElementFamily.P, mesh.basix_cell(), 1, dtype=float_type
+    basix.ElementFamily.P, cell_type, 1, dtype=float_type
 )
 gtable = gelement.tabulate(1, pts)
 dphi = gtable[1:, :, :, 0]
@@ -121,7 +125,7 @@ boundary_facets = locate_entities_boundary(
     mesh, mesh.topology.dim - 1, lambda x: np.full(x.shape[1], True, dtype=bool)
 )
 
-boundary_data = facet_integration_domain(
+cells_b, lfacet_b = facet_integration_domain(
     boundary_facets, mesh
 )  # cells with boundary facets
 local_facet_dof = np.array(
@@ -138,33 +142,27 @@ pts_0 = pts_f[:, 0]
 pts_1 = pts_f[:, 1]
 
 pts_f = np.zeros((6, nq_f, 3), dtype=float_type)
-pts_f[0, :, :] = np.c_[pts_0, pts_1, np.zeros(nq_f, dtype=float_type)]  # z = 0
-pts_f[1, :, :] = np.c_[pts_0, np.zeros(nq_f, dtype=float_type), pts_1]  # y = 0
-pts_f[2, :, :] = np.c_[np.zeros(nq_f, dtype=float_type), pts_0, pts_1]  # x = 0
-pts_f[3, :, :] = np.c_[np.ones(nq_f, dtype=float_type), pts_0, pts_1]  # x = 1
-pts_f[4, :, :] = np.c_[pts_0, np.ones(nq_f, dtype=float_type), pts_1]  # y = 1
-pts_f[5, :, :] = np.c_[pts_0, pts_1, np.ones(nq_f, dtype=float_type)]  # z = 1
+pts_f[0, :, 0], pts_f[0, :, 1] = pts_0, pts_1  # z = 0
+pts_f[1, :, 0], pts_f[1, :, 2] = pts_0, pts_1  # y = 0
+pts_f[2, :, 1], pts_f[2, :, 2] = pts_0, pts_1  # x = 0
+pts_f[3, :, 0], pts_f[3, :, 1], pts_f[3, :, 2] = 1.0, pts_0, pts_1  # x = 1
+pts_f[4, :, 0], pts_f[4, :, 1], pts_f[4, :, 2] = pts_0, 1.0, pts_1  # y = 1
+pts_f[5, :, 0], pts_f[5, :, 1], pts_f[5, :, 2] = pts_0, pts_1, 1.0  # z = 1
 
 # Derivatives on the facets of the reference hexahedron
-dphi_f = np.zeros((6, 3, nq_f, 8), dtype=float_type)
-
-for f in range(6):
-    gtable_f = gelement.tabulate(1, pts_f[f, :, :]).astype(float_type)
-    dphi_f[f, :, :, :] = gtable_f[1:, :, :, 0]
+gtable_f = gelement.tabulate(1, pts_f.reshape(6 * nq_f, 3)).astype(float_type)
+dphi_f = (
+    gtable_f[1:, :, :, 0].reshape(3, 6, nq_f, 8).transpose(1, 0, 2, 3).copy()
+)
 
 # Compute scaled Jacobian determinant (boundary facets)
-detJ_f = np.zeros((boundary_data.shape[0], nq_f), dtype=float_type)
+detJ_f = np.zeros((cells_b.size, nq_f), dtype=float_type)
 compute_boundary_facets_scaled_jacobian_determinant(
-    detJ_f, (x_dofs, x_g), boundary_data, dphi_f, wts_f
+    detJ_f, (x_dofs, x_g), (cells_b, lfacet_b), dphi_f, wts_f
 )
 
 # Create boundary facets dofmap
-bfacet_dofmap = np.zeros(
-    (boundary_data.shape[0], local_facet_dof.shape[1]), dtype=np.int32
-)
-
-for i, (cell, local_facet) in enumerate(boundary_data):
-    bfacet_dofmap[i, :] = dofmap[cell][local_facet_dof[local_facet]]
+bfacet_dofmap = dofmap[cells_b[:, np.newaxis], local_facet_dof[lfacet_b]]
 
 bfacet_constants = np.ones(bfacet_dofmap.shape[0], dtype=float_type)
 
@@ -174,11 +172,12 @@ bfacet_constants = np.ones(bfacet_dofmap.shape[0], dtype=float_type)
 
 b[:] = 0.0
 mass_operator_cell = mass_operator(Nd, float_type)
-mass_operator_cell(u, cell_constants, b, detJ, dofmap)
+for i in range(num_warmup):
+    mass_operator_cell(u, cell_constants, b, detJ, dofmap)
 b0.x.scatter_reverse(InsertMode.add)
 
 # Timing mass operator function
-timing_mass_operator = np.empty(10)
+timing_mass_operator = np.empty(num_repeat)
 for i in range(timing_mass_operator.size):
     b[:] = 0.0
     tic = perf_counter_ns()
@@ -220,11 +219,12 @@ u0.interpolate(
 )
 b[:] = 0.0
 stiff_operator_cell = stiffness_operator(P, dphi_1D, float_type)
-stiff_operator_cell(u, cell_constants, b, G, dofmap)
+for i in range(num_warmup):
+    stiff_operator_cell(u, cell_constants, b, G, dofmap)
 b0.x.scatter_reverse(InsertMode.add)
 
 # Timing stiffness operator function
-timing_stiffness_operator = np.zeros(10)
+timing_stiffness_operator = np.empty(num_repeat)
 for i in range(timing_stiffness_operator.size):
     b[:] = 0.0
     tic = perf_counter_ns()
@@ -247,11 +247,12 @@ print(
 b[:] = 0.0
 u[:] = 1.0
 mass_operator_bfacet = mass_operator(Nf, float_type)
-mass_operator_bfacet(u, bfacet_constants, b, detJ_f, bfacet_dofmap)
+for i in range(num_warmup):
+    mass_operator_bfacet(u, bfacet_constants, b, detJ_f, bfacet_dofmap)
 b0.x.scatter_reverse(InsertMode.add)
 
 # Timing boundary operator function
-timing_boundary_operator = np.empty(10)
+timing_boundary_operator = np.empty(num_repeat)
 for i in range(timing_boundary_operator.size):
     b[:] = 0.0
     tic = perf_counter_ns()
@@ -55,23 +55,21 @@ imap = V.dofmap.index_map
 nlocal = imap.size_local
 nghost = imap.num_ghosts
 owners = imap.owners
-unique_owners, owners_size = np.unique(owners, return_counts=True)
-owners_idx = np.argsort(owners)
+owners_count = np.bincount(owners, minlength=comm.size)
+unique_owners = np.flatnonzero(owners_count)
+owners_size = owners_count[unique_owners]
+owners_idx = np.argsort(owners, kind="stable")
 
 owners_offsets = np.cumsum(owners_size)
 owners_offsets = np.insert(owners_offsets, 0, 0)
 
 # Compute owned data by this process that are ghosts data in other process
 shared_dofs = imap.index_to_dest_ranks()
-shared_ranks = np.unique(shared_dofs.array)
-
-ghosts = []
-for shared_rank in shared_ranks:
-    for dof in range(nlocal):
-        if shared_rank in shared_dofs.links(dof):
-            ghosts.append(shared_rank)
-
-ghosts = np.array(ghosts)
+shared_offsets = shared_dofs.offsets
+shared_dofs_of_link = np.repeat(
+    np.arange(shared_offsets.size - 1), np.diff(shared_offsets)
+)
+ghosts = shared_dofs.array[shared_dofs_of_link < nlocal]
 unique_ghosts, ghosts_size = np.unique(ghosts, return_counts=True)
 ghosts_offsets = np.cumsum(ghosts_size)
 ghosts_offsets = np.insert(ghosts_offsets, 0, 0)
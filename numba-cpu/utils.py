@@ -15,8 +15,8 @@ def facet_integration_domain(facets: npt.NDArray[np.int32], mesh: Mesh):
 
     Returns
     -------
-    boundary_data : array containing the cells and local facets indices on the
-        boundary.
+    cells : array containing the cells indices on the boundary.
+    local_facets : array containing the local facets indices on the boundary.
     """
 
     tdim = mesh.topology.dim
@@ -25,19 +25,16 @@ def facet_integration_domain(facets: npt.NDArray[np.int32], mesh: Mesh):
     cell_to_facet_map = mesh.topology.connectivity(tdim, tdim - 1)
     facet_to_cell_map = mesh.topology.connectivity(tdim - 1, tdim)
 
-    boundary_facet_cell = np.zeros_like(facets, dtype=np.int32)
-    for i, facet in enumerate(facets):
-        boundary_facet_cell[i] = facet_to_cell_map.links(facet)[0]
-
-    boundary_data = np.zeros((facets.size, 2), dtype=np.int32)
+    cells = np.empty(facets.size, dtype=np.int32)
+    local_facets = np.empty(facets.size, dtype=np.int32)
 
-    for i, (facet, cell) in enumerate(zip(facets, boundary_facet_cell)):
-        facets = cell_to_facet_map.links(cell)
-        local_facet = np.where(facet == facets)
-        boundary_data[i, 0] = cell
-        boundary_data[i, 1] = local_facet[0][0]
+    for i, facet in enumerate(facets):
+        cell = facet_to_cell_map.links(facet)[0]
+        cell_facets = cell_to_facet_map.links(cell)
+        cells[i] = cell
+        local_facets[i] = np.flatnonzero(cell_facets == facet)[0]
 
-    return boundary_data
+    return cells, local_facets
 
 
 def compute_eval_params(mesh, points, float_type):